@@ -0,0 +1,292 @@
+import codecs
+import csv
+import io
+import struct
+import zlib
+
+
+class ObstacleGrid:
+    """Read-only view over a packed obstacle bitmap (1 bit per cell, row-major, MSB first)"""
+
+    def __init__(self, width, height, data):
+        self.width = width
+        self.height = height
+        # memoryview keeps lookups zero-copy over the blob loaded from the database
+        self._bits = memoryview(data)
+        if len(self._bits) < FloorPlanImporter.packed_size(width, height):
+            raise ValueError('Obstacle bitmap is smaller than its grid dimensions')
+
+    def is_blocked(self, x, y):
+        index = y * self.width + x
+        return (self._bits[index >> 3] >> (7 - (index & 7))) & 1 == 1
+
+    def count(self):
+        return sum(bin(byte).count('1') for byte in self._bits)
+
+
+class _BitPacker:
+    """Accumulates rows of wall flags into a packed bytearray"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self._current = 0
+        self._filled = 0
+
+    def extend(self, flags):
+        current = self._current
+        filled = self._filled
+        buffer = self.buffer
+        for flag in flags:
+            current = (current << 1) | (1 if flag else 0)
+            filled += 1
+            if filled == 8:
+                buffer.append(current)
+                current = 0
+                filled = 0
+        self._current = current
+        self._filled = filled
+
+    def getvalue(self):
+        if self._filled:
+            return bytes(self.buffer) + bytes([self._current << (8 - self._filled)])
+        return bytes(self.buffer)
+
+
+class FloorPlanImporter:
+    """Streaming importers turning floor-plan exports into packed obstacle bitmaps"""
+
+    # Pixels darker than this luminance are treated as walls
+    WALL_THRESHOLD = 128
+    # Pixels more transparent than this are open floor, whatever their color
+    ALPHA_THRESHOLD = 128
+    PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+    CSV_EMPTY_VALUES = {'', '0', '.', ' ', 'false', 'free'}
+
+    @staticmethod
+    def packed_size(width, height):
+        return (width * height + 7) // 8
+
+    # Decompress at most this many scanlines' worth of PNG data at a time
+    PNG_ROWS_PER_READ = 16
+
+    @staticmethod
+    def load(stream, filename, width=None, height=None):
+        """
+        Dispatch on file extension and return (width, height, packed_bytes).
+        When width/height are given, a grid of any other size is rejected before it is decoded.
+        """
+        name = (filename or '').lower()
+        if name.endswith('.png'):
+            return FloorPlanImporter.from_png(stream, width, height)
+        if name.endswith('.csv') or name.endswith('.txt'):
+            return FloorPlanImporter.from_csv(stream, width, height)
+        raise ValueError('Unsupported floor plan format (expected .png or .csv)')
+
+    @staticmethod
+    def _check_size(width, height, expected_width, expected_height):
+        if (expected_width is not None and width != expected_width) or \
+                (expected_height is not None and height != expected_height):
+            raise ValueError(
+                f'Floor plan is {width}x{height}, building grid is {expected_width}x{expected_height}'
+            )
+
+    @staticmethod
+    def from_csv(stream, expected_width=None, expected_height=None):
+        """
+        Import an occupancy grid from CSV, one row per line.
+        Cells that are empty, '0', '.' or 'free' are walkable; anything else is a wall.
+        """
+        if not isinstance(stream, io.TextIOBase):
+            stream = codecs.iterdecode(stream, 'utf-8-sig')
+
+        packer = _BitPacker()
+        width = None
+        height = 0
+        for row in csv.reader(stream):
+            if not row:
+                continue
+            if width is None:
+                width = len(row)
+                if expected_width is not None and width != expected_width:
+                    raise ValueError(f'Floor plan is {width} cells wide, building grid is {expected_width} wide')
+            elif len(row) != width:
+                raise ValueError(f'CSV row {height + 1} has {len(row)} cells, expected {width}')
+            if expected_height is not None and height >= expected_height:
+                raise ValueError(f'Floor plan has more than {expected_height} rows, building grid is {expected_height} tall')
+            packer.extend(cell.strip().lower() not in FloorPlanImporter.CSV_EMPTY_VALUES for cell in row)
+            height += 1
+
+        if not width:
+            raise ValueError('CSV floor plan is empty')
+        FloorPlanImporter._check_size(width, height, expected_width, expected_height)
+        return width, height, packer.getvalue()
+
+    @staticmethod
+    def from_png(stream, expected_width=None, expected_height=None):
+        """
+        Import an occupancy grid from a non-interlaced PNG, decoding one scanline at a time.
+        Supports 8-bit grayscale/RGB/palette/alpha images and 1-bit grayscale.
+        Transparent pixels (alpha channel or tRNS chunk) are walkable.
+        """
+        if stream.read(8) != FloorPlanImporter.PNG_SIGNATURE:
+            raise ValueError('Not a PNG file')
+
+        width = height = None
+        channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+        palette = None
+        palette_alpha = b''
+        transparent = None
+        decoder = zlib.decompressobj()
+        pending = bytearray()
+        previous = None
+        rows_done = 0
+        packer = _BitPacker()
+        threshold = FloorPlanImporter.WALL_THRESHOLD
+
+        def drain_scanlines():
+            nonlocal previous, rows_done
+            while len(pending) > stride and rows_done < height:
+                line = FloorPlanImporter._unfilter(pending[0], pending[1:stride + 1], previous, pixel_bytes)
+                del pending[:stride + 1]
+                packer.extend(FloorPlanImporter._wall_flags(line, width, bit_depth, color_type, palette, transparent))
+                previous = line
+                rows_done += 1
+
+        while True:
+            header = stream.read(8)
+            if len(header) < 8:
+                raise ValueError('Truncated PNG file')
+            length, chunk_type = struct.unpack('>I4s', header)
+            chunk = stream.read(length)
+            stream.read(4)
+
+            if chunk_type == b'IHDR':
+                if len(chunk) != 13:
+                    raise ValueError('Corrupt PNG header')
+                width, height, bit_depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', chunk)
+                if width == 0 or height == 0:
+                    raise ValueError('PNG image has no pixels')
+                if color_type not in channels:
+                    raise ValueError(f'Unsupported PNG color type {color_type}')
+                if interlace:
+                    raise ValueError('Interlaced PNG files are not supported')
+                if bit_depth != 8 and not (bit_depth == 1 and color_type == 0):
+                    raise ValueError(f'Unsupported PNG bit depth {bit_depth}')
+                FloorPlanImporter._check_size(width, height, expected_width, expected_height)
+                pixel_bytes = channels[color_type] if bit_depth == 8 else 1
+                stride = (width * channels[color_type] * bit_depth + 7) // 8
+            elif chunk_type == b'PLTE':
+                palette = [
+                    (chunk[i] * 299 + chunk[i + 1] * 587 + chunk[i + 2] * 114) // 1000
+                    for i in range(0, len(chunk) - 2, 3)
+                ]
+            elif chunk_type == b'tRNS':
+                if width is None:
+                    raise ValueError('PNG is missing its IHDR chunk')
+                if color_type == 3:
+                    palette_alpha = chunk
+                elif color_type == 0 and len(chunk) >= 2:
+                    transparent = struct.unpack('>H', chunk[:2])[0]
+                elif color_type == 2 and len(chunk) >= 6:
+                    transparent = struct.unpack('>HHH', chunk[:6])
+            elif chunk_type == b'IDAT':
+                if width is None:
+                    raise ValueError('PNG is missing its IHDR chunk')
+                if color_type == 3 and not isinstance(palette, tuple):
+                    if palette is None:
+                        raise ValueError('Palette PNG is missing its PLTE chunk')
+                    # Resolve each palette entry to a wall flag once; missing tRNS entries are opaque
+                    palette = tuple(
+                        luminance < threshold and
+                        (palette_alpha[i] if i < len(palette_alpha) else 255) >= FloorPlanImporter.ALPHA_THRESHOLD
+                        for i, luminance in enumerate(palette)
+                    )
+                # Bounded decompression keeps memory at a few scanlines regardless of chunk size
+                data = chunk
+                while data and rows_done < height:
+                    try:
+                        pending += decoder.decompress(data, (stride + 1) * FloorPlanImporter.PNG_ROWS_PER_READ)
+                    except zlib.error:
+                        raise ValueError('Corrupt PNG image data')
+                    drain_scanlines()
+                    data = decoder.unconsumed_tail
+            elif chunk_type == b'IEND':
+                break
+
+        if width is None:
+            raise ValueError('PNG is missing its IHDR chunk')
+        if rows_done < height:
+            try:
+                pending += decoder.flush()
+            except zlib.error:
+                raise ValueError('Corrupt PNG image data')
+            drain_scanlines()
+
+        if rows_done != height:
+            raise ValueError('Truncated PNG image data')
+        return width, height, packer.getvalue()
+
+    @staticmethod
+    def _unfilter(filter_type, line, previous, bpp):
+        line = bytearray(line)
+        if previous is None:
+            previous = bytes(len(line))
+        if filter_type == 0:
+            pass
+        elif filter_type == 1:
+            for i in range(bpp, len(line)):
+                line[i] = (line[i] + line[i - bpp]) & 0xFF
+        elif filter_type == 2:
+            for i in range(len(line)):
+                line[i] = (line[i] + previous[i]) & 0xFF
+        elif filter_type == 3:
+            for i in range(len(line)):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + previous[i]) >> 1)) & 0xFF
+        elif filter_type == 4:
+            for i in range(len(line)):
+                a = line[i - bpp] if i >= bpp else 0
+                b = previous[i]
+                c = previous[i - bpp] if i >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                if pa <= pb and pa <= pc:
+                    predictor = a
+                elif pb <= pc:
+                    predictor = b
+                else:
+                    predictor = c
+                line[i] = (line[i] + predictor) & 0xFF
+        else:
+            raise ValueError(f'Invalid PNG filter type {filter_type}')
+        return line
+
+    @staticmethod
+    def _wall_flags(line, width, bit_depth, color_type, palette, transparent):
+        """
+        Wall flag per pixel of an unfiltered scanline. `palette` is the resolved per-entry
+        wall flags for palette images; `transparent` is the tRNS key color for gray/RGB.
+        """
+        threshold = FloorPlanImporter.WALL_THRESHOLD
+        opaque = FloorPlanImporter.ALPHA_THRESHOLD
+        if bit_depth == 1:
+            bits = ((line[x >> 3] >> (7 - (x & 7))) & 1 for x in range(width))
+            return (bit == 0 and transparent != 0 for bit in bits)
+        if color_type == 0:
+            return (value < threshold and value != transparent for value in line)
+        if color_type == 3:
+            if max(line) >= len(palette):
+                raise ValueError('PNG palette index out of range')
+            return (palette[index] for index in line)
+        if color_type == 4:
+            return (line[i] < threshold and line[i + 1] >= opaque for i in range(0, len(line), 2))
+        if color_type == 2:
+            return (
+                (line[i] * 299 + line[i + 1] * 587 + line[i + 2] * 114) // 1000 < threshold and
+                (line[i], line[i + 1], line[i + 2]) != transparent
+                for i in range(0, len(line), 3)
+            )
+        return (
+            (line[i] * 299 + line[i + 1] * 587 + line[i + 2] * 114) // 1000 < threshold and line[i + 3] >= opaque
+            for i in range(0, len(line), 4)
+        )
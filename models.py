@@ -3,6 +3,7 @@ from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 import json
+from floorplan import ObstacleGrid
 
 db = SQLAlchemy()
 
@@ -31,6 +32,7 @@ class Building(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     hazards = db.relationship('Hazard', backref='building', lazy=True)
     paths = db.relationship('EvacuationPath', backref='building', lazy=True)
+    floor_plans = db.relationship('FloorPlan', backref='building', lazy=True)
 
 class Hazard(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -42,6 +44,21 @@ class Hazard(db.Model):
     intensity = db.Column(db.Integer, default=1)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class FloorPlan(db.Model):
+    __table_args__ = (db.UniqueConstraint('building_id', 'floor'),)
+    id = db.Column(db.Integer, primary_key=True)
+    building_id = db.Column(db.Integer, db.ForeignKey('building.id'), nullable=False)
+    floor = db.Column(db.Integer, default=1, nullable=False)
+    width = db.Column(db.Integer, nullable=False)
+    height = db.Column(db.Integer, nullable=False)
+    # Static walls packed 1 bit per cell, row-major
+    obstacles = db.Column(db.LargeBinary, nullable=False)
+    wall_count = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def get_grid(self):
+        return ObstacleGrid(self.width, self.height, self.obstacles)
+
 class EvacuationPath(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     building_id = db.Column(db.Integer, db.ForeignKey('building.id'), nullable=False)
@@ -8,9 +8,10 @@ class AdvancedPathFinder:
         return sqrt((a[0] - b[0])**2 + (a[1] - b[1])**2)
 
     @staticmethod
-    def find_path(start, end, width, height, hazards):
+    def find_path(start, end, width, height, hazards, obstacles=None):
         """
-        Find the safest and shortest path using A* algorithm with hazard avoidance
+        Find the safest and shortest path using A* algorithm with hazard avoidance.
+        `obstacles` is an optional ObstacleGrid of static walls that are never crossed.
         """
         
         hazard_map = {}
@@ -55,6 +56,15 @@ class AdvancedPathFinder:
                     neighbor[1] < 0 or neighbor[1] >= height):
                     continue
 
+                if obstacles is not None:
+                    if obstacles.is_blocked(neighbor[0], neighbor[1]):
+                        continue
+                    # Diagonal steps may not squeeze between two walls touching at a corner
+                    if dx != 0 and dy != 0 and (
+                        obstacles.is_blocked(current_pos[0] + dx, current_pos[1]) or
+                        obstacles.is_blocked(current_pos[0], current_pos[1] + dy)):
+                        continue
+
                
                 move_cost = 1.4 if (dx != 0 and dy != 0) else 1.0
                 
@@ -0,0 +1,124 @@
+import io
+import struct
+import zlib
+
+import pytest
+
+from app import Building, User, app, db
+from floorplan import FloorPlanImporter
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        user = User(username='tester', email='tester@example.com')
+        user.set_password('secret')
+        db.session.add(user)
+        db.session.commit()
+        db.session.add(Building(name='Test', width=6, height=6, floors=2, user_id=user.id))
+        db.session.commit()
+
+    client = app.test_client()
+    client.post('/login', data={'username': 'tester', 'password': 'secret'})
+    yield client
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+def upload_diagonal_wall(client, floor=1):
+    csv_data = '\n'.join(','.join('1' if x == y else '0' for x in range(6)) for y in range(6))
+    return client.post('/api/floorplan/1', data={
+        'floor': str(floor), 'file': (io.BytesIO(csv_data.encode()), 'plan.csv')
+    }, content_type='multipart/form-data')
+
+
+def route(client, start, end, **extra):
+    payload = {'building_id': 1, 'start_x': start[0], 'start_y': start[1], 'end_x': end[0], 'end_y': end[1]}
+    payload.update(extra)
+    return client.post('/api/path', json=payload)
+
+
+def test_upload_floor_plan(client):
+    response = upload_diagonal_wall(client)
+    assert response.status_code == 200
+    assert response.json['walls'] == 6
+
+
+def test_path_endpoints_on_walls_are_rejected(client):
+    upload_diagonal_wall(client)
+    assert route(client, (2, 2), (0, 5)).status_code == 400
+    assert route(client, (0, 5), (3, 3)).status_code == 400
+    assert route(client, (0, 5), (2, 4)).json['success'] is True
+
+
+@pytest.mark.parametrize('floor', ['abc', 0, 3, 1.5, None])
+def test_invalid_floor_is_rejected(client, floor):
+    assert route(client, (0, 5), (5, 0), floor=floor).status_code == 400
+    assert upload_diagonal_wall(client, floor=floor).status_code == 400
+
+
+def test_hazards_and_walls_only_apply_to_their_floor(client):
+    with app.app_context():
+        from app import Hazard
+        db.session.add(Hazard(building_id=1, floor=2, x=1, y=0, type='blocked', intensity=1))
+        db.session.commit()
+    upload_diagonal_wall(client, floor=2)
+
+    first = route(client, (0, 0), (2, 0), floor=1).json
+    assert first['path'] == [[0, 0], [1, 0], [2, 0]]
+    assert route(client, (0, 0), (2, 0), floor=2).status_code == 400
+
+
+def corrupt_png(width=6, height=6):
+    def chunk(chunk_type, data):
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+    header = struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0)
+    return (FloorPlanImporter.PNG_SIGNATURE + chunk(b'IHDR', header) +
+            chunk(b'IDAT', b'this is not zlib data') + chunk(b'IEND', b''))
+
+
+def test_corrupt_png_upload_is_rejected(client):
+    response = client.post('/api/floorplan/1', data={
+        'file': (io.BytesIO(corrupt_png()), 'plan.png')
+    }, content_type='multipart/form-data')
+    assert response.status_code == 400
+    assert response.json['error'] == 'Corrupt PNG image data'
+
+
+def test_deleting_floor_plan_reopens_wall_cells(client):
+    upload_diagonal_wall(client)
+    assert route(client, (2, 2), (0, 5)).status_code == 400
+
+    response = client.delete('/api/floorplan/1?floor=1')
+    assert response.status_code == 200
+    path = route(client, (0, 0), (5, 5)).json['path']
+    assert path == [[0, 0], [1, 1], [2, 2], [3, 3], [4, 4], [5, 5]]
+
+
+def test_import_floorplan_command(client, tmp_path):
+    from app import FloorPlan
+
+    good = tmp_path / 'plan.csv'
+    good.write_text('\n'.join(','.join('1' if x == y else '0' for x in range(6)) for y in range(6)))
+    bad = tmp_path / 'bad.png'
+    bad.write_bytes(corrupt_png())
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=['import-floorplan', '1', str(good), '--floor', '2'])
+    assert result.exit_code == 0, result.output
+    assert 'Imported 6 wall cells' in result.output
+    with app.app_context():
+        assert FloorPlan.query.filter_by(building_id=1, floor=2).one().wall_count == 6
+
+    result = runner.invoke(args=['import-floorplan', '1', str(good), '--floor', '3'])
+    assert result.exit_code == 1
+    assert 'Floor must be between 1 and 2' in result.output
+
+    result = runner.invoke(args=['import-floorplan', '1', str(bad)])
+    assert result.exit_code == 1
+    assert 'Corrupt PNG image data' in result.output
+    assert result.exception is None or isinstance(result.exception, SystemExit)
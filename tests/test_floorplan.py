@@ -0,0 +1,212 @@
+import io
+import struct
+import zlib
+
+import pytest
+
+from floorplan import FloorPlanImporter, ObstacleGrid
+
+
+def png_chunk(chunk_type, data):
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+
+def encode_png(width, height, rows, color_type=0, bit_depth=8, idat_size=None):
+    """Minimal PNG writer: `rows` are already-filtered scanlines including their filter byte"""
+    compressed = zlib.compress(b''.join(rows))
+    idat_size = idat_size or len(compressed)
+    idats = b''.join(
+        png_chunk(b'IDAT', compressed[i:i + idat_size]) for i in range(0, len(compressed), idat_size)
+    )
+    header = struct.pack('>IIBBBBB', width, height, bit_depth, color_type, 0, 0, 0)
+    return FloorPlanImporter.PNG_SIGNATURE + png_chunk(b'IHDR', header) + idats + png_chunk(b'IEND', b'')
+
+
+def paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def filter_rows(raw_rows, filter_type, bpp):
+    """Apply one PNG filter type to every raw scanline"""
+    filtered = []
+    previous = bytes(len(raw_rows[0]))
+    for raw in raw_rows:
+        out = bytearray([filter_type])
+        for i, value in enumerate(raw):
+            a = raw[i - bpp] if i >= bpp else 0
+            b = previous[i]
+            c = previous[i - bpp] if i >= bpp else 0
+            predictor = [0, a, b, (a + b) // 2, paeth(a, b, c)][filter_type]
+            out.append((value - predictor) & 0xFF)
+        filtered.append(bytes(out))
+        previous = raw
+    return filtered
+
+
+def grid_cells(width, height, packed):
+    grid = ObstacleGrid(width, height, packed)
+    return [[grid.is_blocked(x, y) for x in range(width)] for y in range(height)]
+
+
+def test_png_larger_than_building_is_rejected_before_decoding():
+    # Header claims 20000x20000 but carries no pixel data; decoding would otherwise run first
+    header = struct.pack('>IIBBBBB', 20000, 20000, 8, 0, 0, 0, 0)
+    data = FloorPlanImporter.PNG_SIGNATURE + png_chunk(b'IHDR', header) + png_chunk(b'IEND', b'')
+    with pytest.raises(ValueError, match='20000x20000'):
+        FloorPlanImporter.load(io.BytesIO(data), 'plan.png', 50, 50)
+
+
+def test_csv_size_mismatch_is_rejected():
+    with pytest.raises(ValueError, match='wide'):
+        FloorPlanImporter.load(io.BytesIO(b'0,0,0\n0,0,0'), 'plan.csv', 2, 2)
+    with pytest.raises(ValueError, match='rows'):
+        FloorPlanImporter.load(io.BytesIO(b'0,0\n0,0\n0,0'), 'plan.csv', 2, 2)
+    with pytest.raises(ValueError, match='2x1'):
+        FloorPlanImporter.load(io.BytesIO(b'0,0'), 'plan.csv', 2, 2)
+
+
+def test_png_single_large_idat_decodes_in_bounded_steps():
+    width, height = 300, 200
+    rows = [bytes([0]) + bytes(0 if (x + y) % 7 == 0 else 255 for x in range(width)) for y in range(height)]
+    data = encode_png(width, height, rows)
+    assert FloorPlanImporter.load(io.BytesIO(data), 'plan.png', width, height)[:2] == (width, height)
+
+    cells = grid_cells(*FloorPlanImporter.from_png(io.BytesIO(data)))
+    assert all(cells[y][x] == ((x + y) % 7 == 0) for y in range(height) for x in range(width))
+
+
+# Wall pattern used by the round-trip tests: a frame plus a diagonal
+WIDTH, HEIGHT = 11, 7
+WALLS = [[x in (0, WIDTH - 1) or y in (0, HEIGHT - 1) or x == y for x in range(WIDTH)] for y in range(HEIGHT)]
+# Free cells drawn as transparent black, like the background of a CAD export; they must stay walkable
+CLEAR = [[not WALLS[y][x] and (x + 2 * y) % 3 == 0 for x in range(WIDTH)] for y in range(HEIGHT)]
+# Dark gray used as the tRNS color key; shade() never produces it for real walls
+KEY = 91
+
+
+def shade(wall, x, y, k=0):
+    """Varying dark/light values so every filter predictor (including Paeth ties) gets exercised"""
+    return (7 * x + 13 * y + 29 * k) % 90 if wall else 165 + (11 * x + 5 * y + 17 * k) % 90
+
+
+def opaque_alpha(x, y):
+    return 128 + (x * 37 + y * 11) % 128
+
+
+# color type -> (bytes per pixel, encoder for a wall / free / transparent pixel, chunks inserted after IHDR)
+PIXELS = {
+    0: (1, lambda wall, clear, x, y: bytes([KEY if clear else shade(wall, x, y)]),
+        png_chunk(b'tRNS', struct.pack('>H', KEY))),
+    2: (3, lambda wall, clear, x, y: bytes([KEY] * 3 if clear else [shade(wall, x, y, k) for k in range(3)]),
+        png_chunk(b'tRNS', struct.pack('>HHH', KEY, KEY, KEY))),
+    # Palette: white, black, light grey, dark grey, fully transparent black
+    3: (1, lambda wall, clear, x, y: bytes([4 if clear else (1 if wall else 0) + 2 * ((x + y) % 2)]),
+        png_chunk(b'PLTE', bytes([255, 255, 255, 0, 0, 0, 200, 200, 200, 60, 60, 60, 0, 0, 0])) +
+        png_chunk(b'tRNS', bytes([255, 255, 255, 255, 0]))),
+    4: (2, lambda wall, clear, x, y: bytes([0, 0] if clear else [shade(wall, x, y), opaque_alpha(x, y)]), b''),
+    6: (4, lambda wall, clear, x, y: bytes(
+        [0, 0, 0, 0] if clear else [shade(wall, x, y, k) for k in range(3)] + [opaque_alpha(x, y)]), b''),
+}
+
+
+@pytest.mark.parametrize('filter_type', [0, 1, 2, 3, 4])
+@pytest.mark.parametrize('color_type', sorted(PIXELS))
+def test_png_round_trip(color_type, filter_type):
+    bpp, encode_pixel, extra_chunks = PIXELS[color_type]
+    raw_rows = [
+        b''.join(encode_pixel(wall, CLEAR[y][x], x, y) for x, wall in enumerate(row))
+        for y, row in enumerate(WALLS)
+    ]
+    data = encode_png(WIDTH, HEIGHT, filter_rows(raw_rows, filter_type, bpp), color_type, idat_size=17)
+    ihdr_end = 8 + 12 + 13
+    data = data[:ihdr_end] + extra_chunks + data[ihdr_end:]
+
+    assert grid_cells(*FloorPlanImporter.from_png(io.BytesIO(data))) == WALLS
+
+
+def test_png_transparent_background_is_walkable():
+    # One opaque black pixel next to one fully transparent black pixel
+    data = encode_png(2, 1, [bytes([0, 0, 0, 0, 255, 0, 0, 0, 0])], color_type=6)
+    assert grid_cells(*FloorPlanImporter.from_png(io.BytesIO(data))) == [[True, False]]
+
+
+@pytest.mark.parametrize('filter_type', [0, 1, 2, 3, 4])
+def test_png_one_bit_grayscale_round_trip(filter_type):
+    raw_rows = []
+    for row in WALLS:
+        packed = bytearray((WIDTH + 7) // 8)
+        for x, wall in enumerate(row):
+            if not wall:
+                packed[x >> 3] |= 0x80 >> (x & 7)
+        raw_rows.append(bytes(packed))
+    data = encode_png(WIDTH, HEIGHT, filter_rows(raw_rows, filter_type, 1), bit_depth=1)
+
+    assert grid_cells(*FloorPlanImporter.from_png(io.BytesIO(data))) == WALLS
+
+
+def test_png_paeth_tie_prefers_up_over_upper_left():
+    # left=10, up=40, upper-left=20 ties the up and upper-left distances; PNG picks up
+    raw_rows = [bytes([20, 40]), bytes([10, 130])]
+    data = encode_png(2, 2, filter_rows(raw_rows, 4, 1))
+
+    assert grid_cells(*FloorPlanImporter.from_png(io.BytesIO(data))) == [[True, True], [True, False]]
+
+
+def test_png_rejects_unsupported_and_truncated_files():
+    with pytest.raises(ValueError, match='Not a PNG'):
+        FloorPlanImporter.from_png(io.BytesIO(b'GIF89a'))
+    full = encode_png(WIDTH, HEIGHT, [bytes(WIDTH + 1)] * HEIGHT)
+    with pytest.raises(ValueError, match='Truncated'):
+        FloorPlanImporter.from_png(io.BytesIO(full[:40]))
+    sixteen_bit = encode_png(2, 2, [bytes(5)] * 2, bit_depth=16)
+    with pytest.raises(ValueError, match='bit depth'):
+        FloorPlanImporter.from_png(io.BytesIO(sixteen_bit))
+
+
+def test_png_rejects_malformed_headers_and_palettes():
+    short_header = FloorPlanImporter.PNG_SIGNATURE + png_chunk(b'IHDR', b'\x00' * 5) + png_chunk(b'IEND', b'')
+    with pytest.raises(ValueError, match='header'):
+        FloorPlanImporter.from_png(io.BytesIO(short_header))
+
+    empty = encode_png(0, 0, [b'\x00'])
+    with pytest.raises(ValueError, match='no pixels'):
+        FloorPlanImporter.from_png(io.BytesIO(empty))
+
+    # Index 2 points past a two-entry palette
+    data = encode_png(2, 1, [bytes([0, 0, 2])], color_type=3)
+    ihdr_end = 8 + 12 + 13
+    data = data[:ihdr_end] + png_chunk(b'PLTE', bytes([255, 255, 255, 0, 0, 0])) + data[ihdr_end:]
+    with pytest.raises(ValueError, match='palette index'):
+        FloorPlanImporter.from_png(io.BytesIO(data))
+
+
+def test_csv_round_trip_with_wall_markers():
+    text = '\n'.join(','.join('#' if wall else '.' for wall in row) for row in WALLS)
+    assert grid_cells(*FloorPlanImporter.from_csv(io.BytesIO(text.encode()))) == WALLS
+
+
+def test_csv_with_bom_and_blank_lines():
+    width, height, packed = FloorPlanImporter.from_csv(io.BytesIO(b'\xef\xbb\xbf1,0\r\n\r\n0,free\r\n'))
+    assert (width, height) == (2, 2)
+    assert grid_cells(width, height, packed) == [[True, False], [False, False]]
+
+
+def test_csv_ragged_rows_are_rejected():
+    with pytest.raises(ValueError, match='row 2 has 3 cells, expected 2'):
+        FloorPlanImporter.from_csv(io.BytesIO(b'0,0\n0,0,1\n'))
+
+
+def test_csv_empty_input_is_rejected():
+    with pytest.raises(ValueError, match='empty'):
+        FloorPlanImporter.from_csv(io.BytesIO(b''))
+    with pytest.raises(ValueError, match='empty'):
+        FloorPlanImporter.from_csv(io.BytesIO(b'\n\n'))
+
+
+def test_load_rejects_unknown_extension():
+    with pytest.raises(ValueError, match='Unsupported'):
+        FloorPlanImporter.load(io.BytesIO(b''), 'plan.bmp')
@@ -0,0 +1,16 @@
+import pytest
+
+from loadtest import percentile
+
+
+@pytest.mark.parametrize('pct, expected', [(50, 50), (95, 95), (99, 99), (100, 100), (1, 1)])
+def test_percentile_nearest_rank_on_hundred_samples(pct, expected):
+    assert percentile(list(range(1, 101)), pct) == expected
+
+
+def test_percentile_small_samples():
+    values = list(range(1, 21))
+    assert percentile(values, 95) == 19
+    assert percentile(values, 99) == 20
+    assert percentile([7], 99) == 7
+    assert percentile([], 99) == 0.0
@@ -0,0 +1,38 @@
+import io
+
+import pytest
+
+import app
+import pathfinder
+from floorplan import FloorPlanImporter, ObstacleGrid
+
+# app.py carries its own copy of the pathfinder; both must behave the same
+finders = pytest.mark.parametrize('finder', [pathfinder.AdvancedPathFinder, app.AdvancedPathFinder])
+
+
+def diagonal_wall_grid(size=6):
+    csv_data = '\n'.join(','.join('1' if x == y else '0' for x in range(size)) for y in range(size))
+    width, height, packed = FloorPlanImporter.from_csv(io.BytesIO(csv_data.encode()))
+    return ObstacleGrid(width, height, packed)
+
+
+@finders
+def test_path_avoids_walls(finder):
+    grid = diagonal_wall_grid()
+    path, cost = finder.find_path((0, 3), (3, 5), 6, 6, [], grid)
+    assert path is not None
+    assert not any(grid.is_blocked(x, y) for x, y in path)
+
+
+@finders
+def test_path_does_not_cut_diagonally_between_walls(finder):
+    grid = diagonal_wall_grid()
+    path, cost = finder.find_path((0, 3), (3, 0), 6, 6, [], grid)
+    assert path is None
+    assert cost == float('inf')
+
+
+@finders
+def test_path_without_obstacles_is_unchanged(finder):
+    path, cost = finder.find_path((0, 3), (3, 0), 6, 6, [])
+    assert path == [(0, 3), (1, 2), (2, 1), (3, 0)]